@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class MainConfig(AppConfig):
+    name = 'main'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,69 @@
+"""Cached lookups on the per-request authentication path.
+
+Every ``@login_required`` view needs the session, the ``User`` row and the
+user's organization memberships. Sessions use Django's ``cached_db`` engine
+(read from the cache, written through to the database only when they
+change); the user and memberships are cached here and invalidated by the
+signal handlers in ``main.signals`` whenever the underlying rows change.
+
+Setting ``AUTH_CACHE_TIMEOUT = 0`` disables the user and membership caches.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .models import OrganizationUser
+
+
+def _user_key(user_id):
+    return f'auth:user:{user_id}'
+
+
+def _memberships_key(user_id):
+    return f'auth:memberships:{user_id}'
+
+
+class CachedModelBackend(ModelBackend):
+    """``ModelBackend`` that loads the session's user from the cache."""
+
+    def get_user(self, user_id):
+        if not settings.AUTH_CACHE_TIMEOUT:
+            return super().get_user(user_id)
+        key = _user_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_CACHE_TIMEOUT)
+        return user
+
+
+def get_memberships(user):
+    """The user's ``OrganizationUser`` rows with their organizations loaded."""
+    if not settings.AUTH_CACHE_TIMEOUT:
+        return list(OrganizationUser.objects.filter(user=user).select_related('organization'))
+    key = _memberships_key(user.pk)
+    memberships = cache.get(key)
+    if memberships is None:
+        memberships = list(OrganizationUser.objects.filter(user=user).select_related('organization'))
+        cache.set(key, memberships, settings.AUTH_CACHE_TIMEOUT)
+    return memberships
+
+
+def get_membership(user, organization_id):
+    """The user's membership of one organization.
+
+    Raises ``OrganizationUser.DoesNotExist`` like ``OrganizationUser.objects.get``.
+    """
+    for membership in get_memberships(user):
+        if membership.organization_id == int(organization_id):
+            return membership
+    raise OrganizationUser.DoesNotExist
+
+
+def invalidate_user(user_id):
+    cache.delete_many([_user_key(user_id), _memberships_key(user_id)])
+
+
+def invalidate_memberships(user_ids):
+    cache.delete_many([_memberships_key(user_id) for user_id in user_ids])
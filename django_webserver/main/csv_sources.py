@@ -0,0 +1,200 @@
+"""CSV data sources stored in S3.
+
+Previews fetch only the head of the object with a byte-range GET. Full scans
+split the object into fixed-size ranges that are fetched in parallel over a
+single pooled client and stitched back together in order.
+"""
+import codecs
+import csv
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from django.conf import settings
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Return the process-wide S3 client (boto3 clients are thread-safe)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = boto3.session.Session().client(
+                's3',
+                endpoint_url=settings.AWS_S3_ENDPOINT_URL,
+                config=Config(
+                    max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                    retries={'max_attempts': 3, 'mode': 'standard'},
+                ),
+            )
+        return _client
+
+
+def parse_s3_uri(uri):
+    """Split an s3://bucket/key URI into (bucket, key)."""
+    parsed = urlparse(uri)
+    if parsed.scheme != 's3' or not parsed.netloc or not parsed.path.lstrip('/'):
+        raise ValueError('CSV data sources must be s3://bucket/key URIs')
+    return parsed.netloc, parsed.path.lstrip('/')
+
+
+def table_name(uri):
+    """Name shown for the single table a CSV object exposes."""
+    _, key = parse_s3_uri(uri)
+    return os.path.splitext(os.path.basename(key))[0] or key
+
+
+def object_size(uri):
+    """Size of the object in bytes (also serves as a connection test)."""
+    bucket, key = parse_s3_uri(uri)
+    return get_s3_client().head_object(Bucket=bucket, Key=key)['ContentLength']
+
+
+def _get_range(bucket, key, start, end):
+    response = get_s3_client().get_object(Bucket=bucket, Key=key, Range=f'bytes={start}-{end}')
+    return response['Body'].read()
+
+
+def read_head(uri, nbytes):
+    """Fetch the first ``nbytes`` of the object.
+
+    Returns ``(data, complete)`` where ``complete`` is True when the whole
+    object fitted in the requested range.
+    """
+    bucket, key = parse_s3_uri(uri)
+    try:
+        response = get_s3_client().get_object(Bucket=bucket, Key=key, Range=f'bytes=0-{nbytes - 1}')
+    except ClientError as e:
+        # S3 rejects any range on an empty object
+        if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+            return b'', True
+        raise
+    data = response['Body'].read()
+    content_range = response.get('ContentRange')
+    total = int(content_range.rsplit('/', 1)[1]) if content_range else len(data)
+    return data, len(data) >= total
+
+
+def iter_chunks(uri):
+    """Yield the object's bytes in order, fetching ranges in parallel.
+
+    At most ``S3_MAX_POOL_CONNECTIONS`` ranges are in flight (or buffered)
+    at once, so memory stays bounded regardless of object size.
+    """
+    bucket, key = parse_s3_uri(uri)
+    size = object_size(uri)
+    range_size = settings.S3_RANGE_SIZE
+    workers = settings.S3_MAX_POOL_CONNECTIONS
+    starts = iter(range(0, size, range_size))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start in starts:
+            pending.append(executor.submit(_get_range, bucket, key, start, min(start + range_size, size) - 1))
+            if len(pending) >= workers:
+                break
+        while pending:
+            chunk = pending.popleft().result()
+            start = next(starts, None)
+            if start is not None:
+                pending.append(executor.submit(_get_range, bucket, key, start, min(start + range_size, size) - 1))
+            yield chunk
+
+
+def _iter_lines(chunks):
+    """Decode byte chunks and yield lines with their line endings kept."""
+    decoder = codecs.getincrementaldecoder('utf-8-sig')(errors='replace')
+    buffer = ''
+    for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        lines = buffer.split('\n')
+        buffer = lines.pop()
+        for line in lines:
+            yield line + '\n'
+    buffer += decoder.decode(b'', final=True)
+    if buffer:
+        yield buffer
+
+
+def _to_row(columns, values):
+    return {col: (values[i] if i < len(values) and values[i] != '' else None) for i, col in enumerate(columns)}
+
+
+def preview_rows(uri, limit=10):
+    """Return ``(columns, rows)`` for the first ``limit`` rows of the object.
+
+    Starts with ``CSV_PREVIEW_BYTES`` and widens the range only if the head
+    did not contain enough complete rows.
+    """
+    nbytes = settings.CSV_PREVIEW_BYTES
+    while True:
+        data, complete = read_head(uri, nbytes)
+        if not complete:
+            # Drop the partial line at the end of the range
+            data = data[:data.rfind(b'\n') + 1]
+        records = list(csv.reader(_iter_lines([data])))
+        if not complete and records:
+            # The last record may still be cut short inside a quoted field
+            records.pop()
+        if complete or len(records) > limit:
+            break
+        nbytes *= 4
+    if not records:
+        return [], []
+    columns = records[0]
+    return columns, [_to_row(columns, values) for values in records[1:limit + 1]]
+
+
+def scan_rows(uri):
+    """Return ``(columns, rows)`` where ``rows`` lazily yields every row."""
+    reader = csv.reader(_iter_lines(iter_chunks(uri)))
+    columns = next(reader, [])
+    return columns, (_to_row(columns, values) for values in reader)
+
+
+def _infer_type(value, current):
+    if current == 'TEXT':
+        return current
+    try:
+        int(value)
+        return current or 'INTEGER'
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return 'FLOAT'
+    except ValueError:
+        return 'TEXT'
+
+
+def profile(uri):
+    """Full scan of the object: column types, nullability and row count.
+
+    Returns a list shaped like the SQL inspector output used by
+    ``explore.html`` (a CSV object is a single table).
+    """
+    columns, rows = scan_rows(uri)
+    types = {col: None for col in columns}
+    nullable = {col: False for col in columns}
+    row_count = 0
+    for row in rows:
+        row_count += 1
+        for col, value in row.items():
+            if value is None:
+                nullable[col] = True
+            else:
+                types[col] = _infer_type(value, types[col])
+    return [{
+        'name': table_name(uri),
+        'row_count': row_count,
+        'columns': [
+            {'name': col, 'type': types[col] or 'TEXT', 'nullable': nullable[col]}
+            for col in columns
+        ],
+    }]
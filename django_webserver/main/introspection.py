@@ -0,0 +1,99 @@
+"""Schema discovery and reflection for SQL data sources.
+
+Every schema (PostgreSQL) or database (MySQL) is reflected, or only those on
+the data source's allow-list. Each schema is reflected on its own pooled
+connection, with up to ``SCHEMA_REFLECTION_WORKERS`` schemas in flight.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import sqlalchemy
+from django.conf import settings
+
+SYSTEM_SCHEMAS = {
+    'information_schema',
+    'pg_catalog',
+    'pg_toast',
+    'mysql',
+    'performance_schema',
+    'sys',
+}
+
+
+def create_engine(connection_string):
+    """Engine whose pool matches the reflection concurrency."""
+    workers = settings.SCHEMA_REFLECTION_WORKERS
+    return sqlalchemy.create_engine(
+        connection_string,
+        connect_args={'connect_timeout': 5},
+        pool_size=workers,
+        max_overflow=0,
+    )
+
+
+def split_table_name(name):
+    """Split ``schema.table`` into ``(schema, table)``; schema is None if absent."""
+    schema, sep, table = name.partition('.')
+    if not sep:
+        return None, name
+    if not schema or not table:
+        raise ValueError(f'Invalid table name "{name}"')
+    return schema, table
+
+
+def quote_table(dialect, table, schema=None):
+    """Safely quoted, optionally schema-qualified table identifier."""
+    preparer = dialect.identifier_preparer
+    if schema:
+        return f'{preparer.quote_schema(schema)}.{preparer.quote(table)}'
+    return preparer.quote(table)
+
+
+def list_schemas(inspector, allow_list=None):
+    """User schemas visible to the connection, filtered by ``allow_list``."""
+    names = [
+        name for name in inspector.get_schema_names()
+        if name not in SYSTEM_SCHEMAS and not name.startswith('pg_temp_') and not name.startswith('pg_toast_temp_')
+    ]
+    if allow_list:
+        allowed = set(allow_list)
+        names = [name for name in names if name in allowed]
+    return sorted(names)
+
+
+def reflect_schema(engine, schema):
+    """Tables and columns of one schema, reflected on its own connection."""
+    try:
+        with engine.connect() as conn:
+            multi_columns = sqlalchemy.inspect(conn).get_multi_columns(schema=schema)
+    except Exception as e:
+        return {'name': schema, 'tables': [], 'error': str(e)}
+    tables = [
+        {
+            'name': table_name,
+            'qualified_name': f'{schema}.{table_name}',
+            'columns': [
+                {
+                    'name': col['name'],
+                    'type': str(col['type']),
+                    'nullable': col['nullable']
+                }
+                for col in columns
+            ]
+        }
+        for (_, table_name), columns in sorted(multi_columns.items())
+    ]
+    return {'name': schema, 'tables': tables}
+
+
+def reflect_datasource(engine, allow_list=None):
+    """Reflect every selected schema concurrently; returns one dict per schema.
+
+    A schema that fails to reflect (e.g. missing privileges) is reported with
+    an ``error`` instead of failing the whole data source.
+    """
+    schemas = list_schemas(sqlalchemy.inspect(engine), allow_list)
+    if not schemas:
+        return []
+    workers = min(settings.SCHEMA_REFLECTION_WORKERS, len(schemas))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda schema: reflect_schema(engine, schema), schemas))
@@ -0,0 +1,124 @@
+"""Measure the fixed per-request cost of sessions and authentication.
+
+Runs the dashboard and datasource views through the test client with the
+uncached setup (database sessions, ``ModelBackend``, no membership cache)
+and with the cached setup from settings, and reports queries and latency
+per request. Requests are spread round-robin over ``--users`` logged-in
+users, so the cache holds one session, user and membership entry set per
+user; raise it past ``CACHE_ACTIVE_USERS`` to see the cost of culling. All
+fixture rows are created inside a transaction that is rolled back
+afterwards.
+
+The CSV data source is served by an in-memory S3 stand-in, so the
+datasource views run their normal success path without network I/O.
+
+    python manage.py benchmark_auth --requests 200 --users 50
+"""
+import io
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+
+from main import auth_cache, csv_sources
+from main.models import DataSource, Organization, OrganizationUser
+
+BENCH_CSV = b'id,name,score\n' + b''.join(b'%d,name %d,%d.5\n' % (i, i, i) for i in range(100))
+
+
+class InMemoryS3:
+    """Just enough of the S3 client API for csv_sources, backed by one object."""
+
+    def head_object(self, Bucket, Key):
+        return {'ContentLength': len(BENCH_CSV)}
+
+    def get_object(self, Bucket, Key, Range):
+        start, end = (int(x) for x in Range[len('bytes='):].split('-'))
+        body = BENCH_CSV[start:end + 1]
+        return {
+            'Body': io.BytesIO(body),
+            'ContentRange': f'bytes {start}-{start + len(body) - 1}/{len(BENCH_CSV)}',
+        }
+
+
+UNCACHED = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+    'AUTH_CACHE_TIMEOUT': 0,
+}
+
+
+class Command(BaseCommand):
+    help = 'Benchmark per-request query count and latency of the auth hot path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Requests per view and setup')
+        parser.add_argument('--users', type=int, default=1, help='Distinct logged-in users to spread requests over')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        try:
+            with transaction.atomic():
+                self.run(options['requests'], options['users'])
+                transaction.set_rollback(True)
+        finally:
+            teardown_test_environment()
+
+    def run(self, n, user_count):
+        org = Organization.objects.create(name='Benchmark Org', admin_email='bench0@example.com')
+        users = []
+        for i in range(user_count):
+            email = f'bench{i}@example.com'
+            users.append(User.objects.create_user(username=email, email=email, password='bench'))
+            OrganizationUser.objects.create(user=users[-1], organization=org, role='admin' if i == 0 else 'viewer')
+        ds = DataSource.objects.create(
+            organization=org, name='Bench CSV', source_type='csv', connection_string='s3://bench/bench.csv'
+        )
+        urls = [
+            ('dashboard', '/dashboard/'),
+            ('org_detail', f'/org/{org.id}/'),
+            ('explore_datasource', f'/datasource/{ds.id}/explore/'),
+            ('preview_table', f'/datasource/{ds.id}/preview/bench/'),
+        ]
+        cached = {
+            'SESSION_ENGINE': settings.SESSION_ENGINE,
+            'AUTHENTICATION_BACKENDS': settings.AUTHENTICATION_BACKENDS,
+            'AUTH_CACHE_TIMEOUT': settings.AUTH_CACHE_TIMEOUT,
+        }
+
+        self.stdout.write(f'{"view":<20} {"setup":<9} {"queries/req":>12} {"ms/req":>9}')
+        try:
+            with mock.patch.object(csv_sources, 'get_s3_client', return_value=InMemoryS3()):
+                for name, url in urls:
+                    for label, overrides in (('uncached', UNCACHED), ('cached', cached)):
+                        with override_settings(**overrides):
+                            queries, ms = self.measure(users, url, n)
+                        self.stdout.write(f'{name:<20} {label:<9} {queries:>12.1f} {ms:>9.2f}')
+        finally:
+            for user in users:
+                auth_cache.invalidate_user(user.id)
+
+    def measure(self, users, url, n):
+        clients = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            response = client.get(url)  # warm caches
+            assert response.status_code == 200, f'{url} returned {response.status_code}'
+            # The views render errors with a 200 status; make sure we time the success path
+            assert b'<strong>Error:</strong>' not in response.content, f'{url} rendered an error'
+            assert b'"status": "error"' not in response.content, f'{url} returned an error'
+            clients.append(client)
+        with CaptureQueriesContext(connection) as ctx:
+            start = time.perf_counter()
+            for i in range(n):
+                clients[i % len(clients)].get(url)
+            elapsed = time.perf_counter() - start
+        for client in clients:
+            client.logout()
+        return len(ctx.captured_queries) / n, elapsed * 1000 / n
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='datasource',
+            name='schemas',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.db import migrations
+
+from main.search_indexes import create_search_indexes, drop_search_indexes
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0002_datasource_schemas'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # Case-insensitive prefix-search indexes, see main/search_indexes.py. They
+    # are not part of the migration state, so SQLite table rebuilds drop them;
+    # the post_migrate receiver in main/signals.py recreates them.
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
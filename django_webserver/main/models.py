@@ -42,6 +42,7 @@ class DataSource(models.Model):
     name = models.CharField(max_length=255)
     source_type = models.CharField(max_length=20, choices=SOURCE_TYPES)
     connection_string = models.TextField()  # TODO: Encrypt using django-cryptography
+    schemas = models.TextField(blank=True, default='')  # Comma-separated allow-list; empty means all schemas
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -50,3 +51,8 @@ class DataSource(models.Model):
 
     def __str__(self):
         return f"{self.organization.name} - {self.name}"
+
+    @property
+    def schema_allow_list(self):
+        """Schemas to introspect, or an empty list for all of them."""
+        return [s.strip() for s in self.schemas.split(',') if s.strip()]
@@ -0,0 +1,221 @@
+"""Representative row samples for table previews.
+
+Each strategy keeps the cost bounded by the sample size rather than the
+table size:
+
+- PostgreSQL pushes ``TABLESAMPLE BERNOULLI/SYSTEM ... REPEATABLE`` down to
+  the server, with the percentage derived from the planner's row and page
+  estimates and at most ``MAX_SAMPLED_ROWS`` rows read and shuffled.
+- MySQL (and anything else with a single integer primary key) seeks random
+  keys through the primary key index, in batches of ``PROBE_BATCH`` seeks
+  per statement.
+- CSV sources use single-pass reservoir sampling over the full scan.
+"""
+import math
+import random
+
+import sqlalchemy
+
+from .introspection import quote_table
+
+SAMPLE_METHODS = ('system', 'bernoulli')
+
+# Methods accepted from the preview UI. ``reservoir`` is what CSV sources
+# always use; on PostgreSQL it maps to the row-level BERNOULLI method.
+PREVIEW_SAMPLE_METHODS = SAMPLE_METHODS + ('reservoir',)
+
+# Aim TABLESAMPLE at this many times the requested size so sampling
+# variance rarely leaves us short.
+OVERSAMPLE = 4
+
+# SYSTEM picks whole pages, so always sample at least this many pages to
+# draw rows from more than one or two runs of neighbouring rows.
+MIN_SYSTEM_PAGES = 32
+
+# When TABLESAMPLE returns fewer than ``size`` rows, retry with the
+# percentage multiplied by RETRY_FACTOR, at most MAX_ATTEMPTS times in all.
+RETRY_FACTOR = 4
+MAX_ATTEMPTS = 4
+
+# Upper bound on the rows TABLESAMPLE may feed into the shuffle, whatever
+# the percentage or how stale the statistics are. Retries never raise the
+# percentage past the point where this many rows are expected.
+MAX_SAMPLED_ROWS = 100000
+
+# Primary key seeks sent per statement by sample_by_key
+PROBE_BATCH = 100
+
+
+def reservoir_sample(rows, size, seed):
+    """Uniform sample of ``size`` rows from an iterable in a single pass."""
+    rng = random.Random(seed)
+    sample = []
+    for i, row in enumerate(rows):
+        if i < size:
+            sample.append(row)
+        else:
+            j = rng.randint(0, i)
+            if j < size:
+                sample[j] = row
+    return sample
+
+
+def _fetch(conn, query, params=None):
+    result = conn.execute(sqlalchemy.text(query), params or {})
+    return list(result.keys()), [dict(row._mapping) for row in result.fetchall()]
+
+
+def tablesample_percent(method, estimated_rows, pages, size):
+    """Percentage of the table to sample for about ``OVERSAMPLE * size`` rows.
+
+    BERNOULLI picks individual rows, so the percentage follows the row
+    estimate. SYSTEM picks whole pages, so the percentage follows the page
+    count and never covers fewer than ``MIN_SYSTEM_PAGES`` pages. Returns
+    None when the table has never been analyzed.
+    """
+    target_rows = size * OVERSAMPLE
+    if estimated_rows <= 0 or pages <= 0:
+        return None
+    if method == 'system':
+        rows_per_page = max(estimated_rows / pages, 1.0)
+        target_pages = max(MIN_SYSTEM_PAGES, math.ceil(target_rows / rows_per_page))
+        return min(100.0, 100.0 * target_pages / pages)
+    return min(100.0, 100.0 * target_rows / estimated_rows)
+
+
+def table_estimate(conn, quoted_table):
+    """Planner ``(rows, pages)`` estimate for a table, 0 when unknown.
+
+    Partitioned tables keep their statistics on the leaf partitions (the
+    parent reports -1 rows and 0 pages), so the leaves are summed.
+    ``pg_partition_tree`` returns just the table itself when it is not
+    partitioned.
+    """
+    estimated, pages = conn.execute(
+        sqlalchemy.text(
+            "SELECT SUM(GREATEST(c.reltuples, 0)), SUM(c.relpages) "
+            "FROM pg_partition_tree(to_regclass(:t)) p JOIN pg_class c ON c.oid = p.relid "
+            "WHERE p.isleaf"
+        ),
+        {'t': quoted_table}
+    ).one_or_none() or (0, 0)
+    return estimated or 0, pages or 0
+
+
+def sample_postgresql(conn, quoted_table, size, seed, method='bernoulli'):
+    """Sample with server-side ``TABLESAMPLE``; ``seed`` makes it repeatable.
+
+    Returns ``(columns, rows, method_used)``. BERNOULLI gives a row-level
+    uniform sample. SYSTEM is cheaper but returns whole pages, i.e. runs of
+    physically adjacent rows, so it is an explicit, lower-quality opt-in.
+    The sampled rows are shuffled server-side by a seeded hash before
+    ``LIMIT`` so the result is not biased towards the first pages scanned;
+    an inner ``LIMIT`` keeps that shuffle to ``MAX_SAMPLED_ROWS`` rows.
+
+    If fewer than ``size`` rows come back the percentage is raised and the
+    query retried, up to the percentage expected to yield
+    ``MAX_SAMPLED_ROWS``; past that a short sample is returned. Tables with
+    no statistics get their first ``size`` rows (``method_used`` is then
+    ``first_rows``).
+    """
+    if method not in SAMPLE_METHODS:
+        raise ValueError(f'Unknown sample method "{method}"')
+    estimated, pages = table_estimate(conn, quoted_table)
+    percent = tablesample_percent(method, estimated, pages, size)
+    if percent is None:
+        columns, rows = _fetch(conn, f"SELECT * FROM {quoted_table} LIMIT :limit", {'limit': size})
+        return columns, rows, 'first_rows'
+    max_percent = min(100.0, max(percent, 100.0 * MAX_SAMPLED_ROWS / estimated))
+    # REPEATABLE takes a float seed; keep it inside a 32-bit range
+    seed = seed % 2 ** 31
+    query = (
+        f"SELECT * FROM (SELECT * FROM {quoted_table} TABLESAMPLE {method.upper()} (:percent) "
+        f"REPEATABLE (:seed) LIMIT :scan_limit) AS sampled "
+        f"ORDER BY md5(CAST(ROW(sampled.*) AS text) || CAST(:seed AS text)) LIMIT :limit"
+    )
+    for _ in range(MAX_ATTEMPTS):
+        columns, rows = _fetch(conn, query, {
+            'percent': percent, 'seed': seed, 'scan_limit': MAX_SAMPLED_ROWS, 'limit': size,
+        })
+        if len(rows) >= size or percent >= max_percent:
+            break
+        percent = min(max_percent, percent * RETRY_FACTOR)
+    return columns, rows, method
+
+
+def _probe_query(quoted_table, key, count):
+    # One derived table per probe: each keeps its own ORDER BY ... LIMIT 1
+    # and the UNION ALL works the same on MySQL, PostgreSQL and SQLite
+    return sqlalchemy.text(' UNION ALL '.join(
+        f"SELECT * FROM (SELECT * FROM {quoted_table} WHERE {key} >= :k{i} "
+        f"ORDER BY {key} LIMIT 1) AS probe{i}"
+        for i in range(count)
+    ))
+
+
+def sample_by_key(conn, quoted_table, key_column, size, seed):
+    """Sample by seeking random values of an integer primary key.
+
+    Each probe is a single index seek (``WHERE key >= k ORDER BY key LIMIT 1``),
+    so the cost is ``size`` seeks whatever the table size. Up to
+    ``PROBE_BATCH`` probes share one statement to keep round trips to
+    remote servers down. Rows following large key gaps are somewhat
+    over-represented.
+    """
+    key = conn.dialect.identifier_preparer.quote(key_column)
+    low, high = conn.execute(
+        sqlalchemy.text(f"SELECT MIN({key}), MAX({key}) FROM {quoted_table}")
+    ).one()
+    if low is None:
+        return _fetch(conn, f"SELECT * FROM {quoted_table} LIMIT 0")
+    rng = random.Random(seed)
+    columns, rows, seen = [], [], set()
+    # Give up after 2 * size probes so small or sparse tables stay cheap
+    remaining = size * 2
+    while remaining and len(rows) < size:
+        count = min(PROBE_BATCH, remaining)
+        remaining -= count
+        result = conn.execute(
+            _probe_query(quoted_table, key, count),
+            {f'k{i}': rng.randint(low, high) for i in range(count)}
+        )
+        columns = list(result.keys())
+        for row in result.fetchall():
+            if row._mapping[key_column] not in seen:
+                seen.add(row._mapping[key_column])
+                rows.append(dict(row._mapping))
+                if len(rows) == size:
+                    break
+    return columns, rows
+
+
+def integer_primary_key(inspector, table_name, schema=None):
+    """Name of the table's single integer primary key column, or None."""
+    pk = inspector.get_pk_constraint(table_name, schema=schema).get('constrained_columns') or []
+    if len(pk) != 1:
+        return None
+    for col in inspector.get_columns(table_name, schema=schema):
+        if col['name'] == pk[0]:
+            try:
+                return pk[0] if col['type'].python_type is int else None
+            except NotImplementedError:
+                return None
+    return None
+
+
+def sample_table(engine, conn, table_name, method, size, seed, schema=None):
+    """Pick the sampling strategy for the engine's dialect.
+
+    Returns ``(columns, rows, method_used)``. ``method`` chooses between
+    ``SYSTEM`` and ``BERNOULLI`` on PostgreSQL (anything else means
+    ``BERNOULLI``) and is ignored elsewhere.
+    """
+    quoted_table = quote_table(engine.dialect, table_name, schema)
+    if engine.dialect.name == 'postgresql':
+        method = method if method in SAMPLE_METHODS else 'bernoulli'
+        return sample_postgresql(conn, quoted_table, size, seed, method)
+    key_column = integer_primary_key(sqlalchemy.inspect(conn), table_name, schema)
+    if key_column is not None:
+        return (*sample_by_key(conn, quoted_table, key_column, size, seed), 'key')
+    # No usable key to seek on; anything else would scan the whole table
+    return (*_fetch(conn, f"SELECT * FROM {quoted_table} LIMIT :limit", {'limit': size}), 'first_rows')
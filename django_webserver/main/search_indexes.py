@@ -0,0 +1,79 @@
+"""Case-insensitive indexes for the admin's prefix searches.
+
+The admin matches ``search_fields`` with ``istartswith``, which is
+``UPPER(col::text) LIKE`` on PostgreSQL and ``LIKE`` on SQLite (only served
+by ``NOCASE`` indexes), so a plain index on the column is never used. These
+indexes fold case the same way the lookup does.
+
+``Meta.indexes`` cannot express them portably and ``auth_user`` belongs to
+``contrib.auth``, so Django's migration state does not know about them. On
+SQLite, altering a column rebuilds the table and silently drops indexes
+missing from that state. Migration 0003 creates them, and the
+``post_migrate`` receiver in ``main.signals`` puts back any that a later
+``migrate`` dropped.
+"""
+from django.conf import settings
+from django.db.migrations.recorder import MigrationRecorder
+
+MIGRATION = ('main', '0003_admin_search_indexes')
+
+# (index name, model, field) for every column the admin prefix-searches
+SEARCH_INDEXES = [
+    ('main_org_name_search', 'main.Organization', 'name'),
+    ('main_org_admin_email_search', 'main.Organization', 'admin_email'),
+    ('main_datasource_name_search', 'main.DataSource', 'name'),
+    ('main_user_username_search', settings.AUTH_USER_MODEL, 'username'),
+]
+
+
+def _indexes(apps, connection):
+    """``(index name, table, column)`` for each index this database needs."""
+    for index_name, model_label, field_name in SEARCH_INDEXES:
+        model = apps.get_model(model_label)
+        field = model._meta.get_field(field_name)
+        # MySQL's default collations are case-insensitive, so the unique
+        # index already serves the search
+        if connection.vendor == 'mysql' and field.unique:
+            continue
+        yield index_name, model._meta.db_table, field.column
+
+
+def create_search_indexes(apps, schema_editor):
+    """Create the search indexes that do not exist yet."""
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    with connection.cursor() as cursor:
+        for index_name, table, column in _indexes(apps, connection):
+            if index_name in connection.introspection.get_constraints(cursor, table):
+                continue
+            if connection.vendor == 'sqlite':
+                sql = f'CREATE INDEX {quote(index_name)} ON {quote(table)} ({quote(column)} COLLATE NOCASE)'
+            elif connection.vendor == 'postgresql':
+                sql = (
+                    f'CREATE INDEX {quote(index_name)} ON {quote(table)} '
+                    f'((UPPER({quote(column)}::text)) text_pattern_ops)'
+                )
+            else:
+                sql = f'CREATE INDEX {quote(index_name)} ON {quote(table)} ({quote(column)})'
+            schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    quote = schema_editor.quote_name
+    with connection.cursor() as cursor:
+        for index_name, table, _ in _indexes(apps, connection):
+            if index_name not in connection.introspection.get_constraints(cursor, table):
+                continue
+            if connection.vendor == 'mysql':
+                schema_editor.execute(f'DROP INDEX {quote(index_name)} ON {quote(table)}')
+            else:
+                schema_editor.execute(f'DROP INDEX {quote(index_name)}')
+
+
+def restore_search_indexes(apps, connection):
+    """Recreate search indexes dropped by a table rebuild since migration 0003."""
+    if MIGRATION not in MigrationRecorder(connection).applied_migrations():
+        return
+    with connection.schema_editor() as schema_editor:
+        create_search_indexes(apps, schema_editor)
@@ -0,0 +1,40 @@
+"""Keep the ``main.auth_cache`` entries and the admin search indexes in
+step with the database.
+
+Note that ``QuerySet.update()`` does not send these signals; callers that
+bulk-update users or memberships must invalidate the cache themselves.
+"""
+from django.apps import apps as global_apps
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from . import auth_cache, search_indexes
+from .models import Organization, OrganizationUser
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    auth_cache.invalidate_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=OrganizationUser)
+def invalidate_cached_membership(sender, instance, **kwargs):
+    auth_cache.invalidate_memberships([instance.user_id])
+
+
+@receiver(post_save, sender=Organization)
+def invalidate_cached_organization(sender, instance, created, **kwargs):
+    # Memberships embed the organization, so refresh every member's list
+    if not created:
+        member_ids = OrganizationUser.objects.filter(organization=instance).values_list('user_id', flat=True)
+        auth_cache.invalidate_memberships(member_ids)
+
+
+@receiver(post_migrate)
+def restore_search_indexes(sender, app_config, using, apps=global_apps, **kwargs):
+    # SQLite rebuilds a table on most column changes, dropping the search
+    # indexes with it (including auth_user's, on Django upgrades)
+    if app_config.name == 'main':
+        search_indexes.restore_search_indexes(apps, connections[using])
@@ -5,7 +5,10 @@ from django.contrib.auth import authenticate, login as auth_login
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
 from django.http import HttpResponse, JsonResponse
+from django.conf import settings
 from .models import Organization, OrganizationUser, DataSource
+from . import auth_cache, csv_sources, introspection, sampling
+import random
 import sqlalchemy
 
 
@@ -56,7 +59,7 @@ def signup(request):
         OrganizationUser.objects.create(user=user, organization=org, role='admin')
         
         # Auto-login
-        auth_login(request, user)
+        auth_login(request, user, backend='main.auth_cache.CachedModelBackend')
         return redirect('dashboard')
     
     return render(request, 'signup.html')
@@ -65,7 +68,7 @@ def signup(request):
 @login_required
 def dashboard(request):
     """User dashboard showing their organizations."""
-    user_orgs = OrganizationUser.objects.filter(user=request.user).select_related('organization')
+    user_orgs = auth_cache.get_memberships(request.user)
     return render(request, 'dashboard.html', {'user_orgs': user_orgs})
 
 
@@ -73,7 +76,7 @@ def dashboard(request):
 def org_detail(request, org_id):
     """Organization detail page with data sources."""
     try:
-        org_user = OrganizationUser.objects.get(user=request.user, organization_id=org_id)
+        org_user = auth_cache.get_membership(request.user, org_id)
         org = org_user.organization
         data_sources = DataSource.objects.filter(organization=org)
         org_members = OrganizationUser.objects.filter(organization=org).select_related('user')
@@ -92,7 +95,7 @@ def org_detail(request, org_id):
 def add_datasource(request, org_id):
     """Add a data source to an organization."""
     try:
-        org_user = OrganizationUser.objects.get(user=request.user, organization_id=org_id)
+        org_user = auth_cache.get_membership(request.user, org_id)
         
         # Only admins can add datasources
         if org_user.role != 'admin':
@@ -102,6 +105,7 @@ def add_datasource(request, org_id):
             name = request.POST.get('name', '').strip()
             source_type = request.POST.get('source_type', '').strip()
             connection_string = request.POST.get('connection_string', '').strip()
+            schemas = request.POST.get('schemas', '').strip()
             
             if not all([name, source_type, connection_string]):
                 return render(request, 'org_detail.html', {
@@ -124,7 +128,8 @@ def add_datasource(request, org_id):
                 organization=org_user.organization,
                 name=name,
                 source_type=source_type,
-                connection_string=connection_string
+                connection_string=connection_string,
+                schemas=schemas
             )
             return redirect('org_detail', org_id=org_id)
         
@@ -139,13 +144,13 @@ def delete_datasource(request, datasource_id):
     """Delete a data source."""
     try:
         ds = DataSource.objects.get(id=datasource_id)
-        org_user = OrganizationUser.objects.get(user=request.user, organization=ds.organization)
+        org_user = auth_cache.get_membership(request.user, ds.organization_id)
         
         # Only admins can delete
         if org_user.role != 'admin':
             return HttpResponse('Unauthorized', status=403)
         
-        org_id = ds.organization.id
+        org_id = ds.organization_id
         ds.delete()
         return redirect('org_detail', org_id=org_id)
     except (DataSource.DoesNotExist, OrganizationUser.DoesNotExist):
@@ -157,7 +162,7 @@ def delete_datasource(request, datasource_id):
 def invite_user(request, org_id):
     """Invite a user to an organization."""
     try:
-        org_user = OrganizationUser.objects.get(user=request.user, organization_id=org_id)
+        org_user = auth_cache.get_membership(request.user, org_id)
         
         # Only admins can invite
         if org_user.role != 'admin':
@@ -198,73 +203,116 @@ def invite_user(request, org_id):
 
 @login_required
 def explore_datasource(request, datasource_id):
-    """Explore datasource schema (tables, columns, types)."""
+    """Explore datasource schemas (tables, columns, types), grouped by schema."""
     try:
         ds = DataSource.objects.get(id=datasource_id)
-        OrganizationUser.objects.get(user=request.user, organization=ds.organization)
+        auth_cache.get_membership(request.user, ds.organization_id)
         
         try:
             if ds.source_type in ['postgresql', 'mysql']:
-                engine = sqlalchemy.create_engine(ds.connection_string, connect_args={'connect_timeout': 5})
-                inspector = sqlalchemy.inspect(engine)
-                
-                tables_info = []
-                for table_name in inspector.get_table_names():
-                    columns = inspector.get_columns(table_name)
-                    columns_info = [
-                        {
-                            'name': col['name'],
-                            'type': str(col['type']),
-                            'nullable': col['nullable']
-                        }
-                        for col in columns
-                    ]
-                    tables_info.append({
-                        'name': table_name,
-                        'columns': columns_info
-                    })
-                
-                return render(request, 'explore.html', {
-                    'datasource': ds,
-                    'tables': tables_info
-                })
+                engine = introspection.create_engine(ds.connection_string)
+                try:
+                    schemas = introspection.reflect_datasource(engine, ds.schema_allow_list)
+                finally:
+                    engine.dispose()
+            elif ds.source_type == 'csv':
+                schemas = [{'name': None, 'tables': csv_sources.profile(ds.connection_string)}]
             else:
                 return HttpResponse('Unsupported datasource type', status=400)
+            
+            return render(request, 'explore.html', {
+                'datasource': ds,
+                'schemas': schemas,
+                'table_count': sum(len(schema['tables']) for schema in schemas)
+            })
         except Exception as e:
             return render(request, 'explore.html', {
                 'datasource': ds,
                 'error': str(e),
-                'tables': []
+                'schemas': [],
+                'table_count': 0
             })
     except (DataSource.DoesNotExist, OrganizationUser.DoesNotExist):
         return HttpResponse('Unauthorized', status=403)
 
 
+def _sample_params(request):
+    """Read and validate ``sample``, ``size`` and ``seed`` from the query string.
+
+    Returns None when sampling was not requested and raises ValueError with
+    a user-facing message for invalid values. A random seed is chosen when
+    none is given and echoed back so the sample can be reproduced.
+    """
+    method = request.GET.get('sample', '').strip().lower()
+    if not method:
+        return None
+    if method not in sampling.PREVIEW_SAMPLE_METHODS:
+        raise ValueError(f'sample must be one of: {", ".join(sampling.PREVIEW_SAMPLE_METHODS)}')
+    try:
+        size = int(request.GET.get('size') or settings.PREVIEW_SAMPLE_DEFAULT_ROWS)
+    except ValueError:
+        raise ValueError('size must be a whole number')
+    if not 1 <= size <= settings.PREVIEW_SAMPLE_MAX_ROWS:
+        raise ValueError(f'size must be between 1 and {settings.PREVIEW_SAMPLE_MAX_ROWS}')
+    try:
+        seed = int(request.GET.get('seed') or random.randrange(2 ** 31))
+    except ValueError:
+        raise ValueError('seed must be a whole number')
+    return {'method': method, 'size': size, 'seed': seed}
+
+
 @login_required
 def preview_table(request, datasource_id, table_name):
-    """Preview sample data from a table."""
+    """Preview sample data from a table.
+
+    ``table_name`` may be schema-qualified (``schema.table``); both parts are
+    quoted as identifiers. By default returns the first 10 rows. With
+    ``?sample=`` a representative sample is returned instead (see
+    ``main.sampling``).
+    """
     try:
         ds = DataSource.objects.get(id=datasource_id)
-        OrganizationUser.objects.get(user=request.user, organization=ds.organization)
+        auth_cache.get_membership(request.user, ds.organization_id)
+        
+        try:
+            sample = _sample_params(request)
+        except ValueError as e:
+            return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
         
         try:
             if ds.source_type in ['postgresql', 'mysql']:
                 engine = sqlalchemy.create_engine(ds.connection_string, connect_args={'connect_timeout': 5})
-                query = sqlalchemy.text(f"SELECT * FROM {table_name} LIMIT 10")
+                schema, table = introspection.split_table_name(table_name)
+                quoted_table = introspection.quote_table(engine.dialect, table, schema)
                 
                 with engine.connect() as conn:
-                    result = conn.execute(query)
-                    columns = list(result.keys())
-                    rows = [dict(row._mapping) for row in result.fetchall()]
-                    
-                    return JsonResponse({
-                        'status': 'success',
-                        'table': table_name,
-                        'columns': columns,
-                        'rows': rows
-                    })
+                    if sample:
+                        columns, rows, sample['method'] = sampling.sample_table(
+                            engine, conn, table, sample['method'], sample['size'], sample['seed'], schema=schema
+                        )
+                    else:
+                        result = conn.execute(sqlalchemy.text(f"SELECT * FROM {quoted_table} LIMIT 10"))
+                        columns = list(result.keys())
+                        rows = [dict(row._mapping) for row in result.fetchall()]
+            elif ds.source_type == 'csv':
+                if sample:
+                    columns, all_rows = csv_sources.scan_rows(ds.connection_string)
+                    rows = sampling.reservoir_sample(all_rows, sample['size'], sample['seed'])
+                    sample['method'] = 'reservoir'
+                else:
+                    columns, rows = csv_sources.preview_rows(ds.connection_string)
             else:
                 return JsonResponse({'status': 'error', 'message': 'Unsupported source type'})
+            
+            response = {
+                'status': 'success',
+                'table': table_name,
+                'columns': columns,
+                'rows': rows
+            }
+            if sample:
+                response['sample'] = sample
+            return JsonResponse(response)
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)})
     except (DataSource.DoesNotExist, OrganizationUser.DoesNotExist):
@@ -276,7 +324,7 @@ def test_connection(request, datasource_id):
     """Test data source connection."""
     try:
         ds = DataSource.objects.get(id=datasource_id)
-        OrganizationUser.objects.get(user=request.user, organization=ds.organization)
+        auth_cache.get_membership(request.user, ds.organization_id)
         
         try:
             if ds.source_type in ['postgresql', 'mysql']:
@@ -284,6 +332,9 @@ def test_connection(request, datasource_id):
                 with engine.connect() as conn:
                     result = conn.execute(sqlalchemy.text("SELECT 1"))
                     return JsonResponse({'status': 'success', 'message': 'Connection successful!'})
+            elif ds.source_type == 'csv':
+                csv_sources.object_size(ds.connection_string)
+                return JsonResponse({'status': 'success', 'message': 'Connection successful!'})
             else:
                 return JsonResponse({'status': 'error', 'message': 'Unsupported source type'})
         except Exception as e:
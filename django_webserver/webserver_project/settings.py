@@ -72,3 +72,42 @@ STATIC_URL = '/static/'
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'index'
+
+# S3-hosted CSV data sources
+# Point AWS_S3_ENDPOINT_URL at an S3-compatible server (e.g. MinIO) for local runs
+AWS_S3_ENDPOINT_URL = os.environ.get('AWS_S3_ENDPOINT_URL') or None
+S3_MAX_POOL_CONNECTIONS = int(os.environ.get('S3_MAX_POOL_CONNECTIONS', 10))
+S3_RANGE_SIZE = 8 * 1024 * 1024  # bytes per parallel GET during full scans
+CSV_PREVIEW_BYTES = 64 * 1024  # initial head range fetched for previews
+
+# Table preview sampling (?sample=bernoulli|system|reservoir&size=N&seed=S)
+PREVIEW_SAMPLE_DEFAULT_ROWS = 10
+PREVIEW_SAMPLE_MAX_ROWS = 1000
+
+# Concurrent per-schema reflection in explore_datasource (also the engine pool size)
+SCHEMA_REFLECTION_WORKERS = 8
+
+# Per-request auth hot path: sessions, the logged-in user and their
+# organization memberships are served from a cache shared by the gunicorn
+# workers; sessions are written through to the database only on change.
+# Each active user holds about 3 entries (session, user, memberships). Past
+# MAX_ENTRIES every write deletes a random third of the cache, sessions
+# included, so size it for the expected number of concurrently active users.
+CACHE_ACTIVE_USERS = int(os.environ.get('CACHE_ACTIVE_USERS', 10000))
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_DIR', '/tmp/django_cache'),
+        'OPTIONS': {'MAX_ENTRIES': 3 * CACHE_ACTIVE_USERS},
+    }
+}
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTHENTICATION_BACKENDS = [
+    'main.auth_cache.CachedModelBackend',
+    # Still listed so sessions created before the cached backend stay valid
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_CACHE_TIMEOUT = 300  # seconds; 0 disables the user/membership cache
+
+# Admin changelists count at most this many rows exactly (see EstimatedCountPaginator)
+ADMIN_EXACT_COUNT_LIMIT = 10000